@@ -0,0 +1,23 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built with CREATE INDEX CONCURRENTLY so the letters table
+    # stays writable during the deploy; that cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='letter',
+            index=models.Index(fields=['is_cancelled', 'number'], name='letter_cancelled_number_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='letter',
+            index=models.Index(condition=models.Q(('is_cancelled', False)), fields=['number'], name='letter_active_number_idx'),
+        ),
+    ]
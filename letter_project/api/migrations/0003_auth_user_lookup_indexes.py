@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Sign-up and password reset look users up case-insensitively, which
+    # PostgreSQL compiles to UPPER(column) = UPPER(value). The built-in
+    # auth_user indexes do not cover that, so add expression indexes.
+    atomic = False
+
+    dependencies = [
+        ('api', '0002_letter_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_email_upper_idx ON auth_user (UPPER(email));',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS auth_user_email_upper_idx;',
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_username_upper_idx ON auth_user (UPPER(username));',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS auth_user_username_upper_idx;',
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Letter numbers come from a sequence so allocation is a single nextval()
+    # call. It continues from the highest number already issued, or starts
+    # at 301 for an empty table.
+
+    dependencies = [
+        ('api', '0003_auth_user_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                'CREATE SEQUENCE letter_number_seq OWNED BY api_letter.number;',
+                "SELECT setval('letter_number_seq', GREATEST(COALESCE(MAX(number), 0), 300)) FROM api_letter;",
+            ],
+            reverse_sql='DROP SEQUENCE letter_number_seq;',
+        ),
+    ]
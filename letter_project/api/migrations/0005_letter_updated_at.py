@@ -0,0 +1,18 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_letter_number_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='letter',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now, help_text='When the letter was last changed. Drives list caching.'),
+            preserve_default=False,
+        ),
+    ]
@@ -16,9 +16,21 @@ class Letter(models.Model):
     
     registered_at = models.DateTimeField(auto_now_add=True, help_text="The exact date and time the letter was registered.")
     is_cancelled = models.BooleanField(default=False, help_text="True if the letter has been cancelled.")
+    # Bulk update() calls must set this explicitly; auto_now only applies on save().
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, help_text="When the letter was last changed. Drives list caching.")
 
     class Meta:
         ordering = ['-number'] # Default order is newest first
+        # `number` is already indexed through its unique constraint, which also
+        # covers the default descending ordering.
+        indexes = [
+            models.Index(fields=['is_cancelled', 'number'], name='letter_cancelled_number_idx'),
+            models.Index(
+                fields=['number'],
+                name='letter_active_number_idx',
+                condition=models.Q(is_cancelled=False),
+            ),
+        ]
 
     def __str__(self):
         status = "CANCELLED" if self.is_cancelled else "Active"
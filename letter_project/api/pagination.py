@@ -0,0 +1,12 @@
+# api/pagination.py
+from rest_framework.pagination import CursorPagination
+
+class LetterCursorPagination(CursorPagination):
+    """
+    Paginates letters newest first. A cursor keeps each page a range scan on
+    the `number` index instead of an OFFSET that grows with the table.
+    """
+    ordering = '-number'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
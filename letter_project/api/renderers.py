@@ -0,0 +1,25 @@
+# api/renderers.py
+from rest_framework.renderers import JSONRenderer
+
+class LetterJSONRenderer(JSONRenderer):
+    """
+    Renders letter payloads with the field names the frontend expects.
+    Keys are renamed in one pass over the output instead of declaring a
+    separate aliased serializer field for each of them.
+    """
+    field_names = {
+        'is_cancelled': 'isCancelled',
+    }
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(self.rename_fields(data), accepted_media_type, renderer_context)
+
+    def rename_fields(self, data):
+        if isinstance(data, dict):
+            return {
+                self.field_names.get(key, key): self.rename_fields(value)
+                for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [self.rename_fields(item) for item in data]
+        return data
@@ -1,16 +1,17 @@
 # api/serializers.py
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import Q
 from .models import Letter
 import re
 
+SIGNUP_EMAIL_RE = re.compile(r"^[a-zA-Z0-9.+_-]+@mosaic-insurance\.com$")
+
 class LetterSerializer(serializers.ModelSerializer):
     """
     Serializer for the Letter model. Converts Letter objects to JSON and back.
     """
-    # Map the frontend field name to the backend field name
-    isCancelled = serializers.BooleanField(source='is_cancelled', read_only=True)
-    
+    # `is_cancelled` is rendered as `isCancelled` by LetterJSONRenderer
     class Meta:
         model = Letter
         fields = [
@@ -20,10 +21,10 @@ class LetterSerializer(serializers.ModelSerializer):
             'addressee', 
             'registered_by_username', 
             'registered_at', 
-            'isCancelled'
+            'is_cancelled'
         ]
         # Mark fields that are set by the server, not the client
-        read_only_fields = ['id', 'number', 'registered_at', 'registered_by_username', 'isCancelled']
+        read_only_fields = ['id', 'number', 'registered_at', 'registered_by_username', 'is_cancelled']
 
     def validate_subject(self, value):
         """Validate that subject is not empty after stripping whitespace"""
@@ -45,11 +46,11 @@ class SignUpSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
     def validate_email(self, value):
-        if not re.match(r"^[a-zA-Z0-9\.\+_-]+@mosaic-insurance\.com$", value):
+        if not SIGNUP_EMAIL_RE.match(value):
             raise serializers.ValidationError("Invalid email format. Must be a 'mosaic-insurance.com' address.")
         
         username = value.split('@')[0]
-        if User.objects.filter(email=value).exists() or User.objects.filter(username=username).exists():
+        if User.objects.filter(Q(email__iexact=value) | Q(username__iexact=username)).exists():
             raise serializers.ValidationError("A user with this email or username already exists.")
             
         return value
@@ -0,0 +1,39 @@
+# api/tasks.py
+import logging
+import threading
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+logger = logging.getLogger(__name__)
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Runs `func` on a daemon thread so the request can return without waiting
+    on slow I/O such as SMTP. Errors are logged, not raised to the caller.
+    """
+    def target():
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logger.exception("Background task %s failed", func.__name__)
+
+    threading.Thread(target=target, daemon=True).start()
+
+
+def send_signup_email(email, username, password):
+    send_mail(
+        'Your Login Credentials for LetterApp',
+        f'Hello,\n\nYour account has been created.\n\nUsername: {username}\nPassword: {password}\n\nPlease change your password after your first login.\n\nThank you!',
+        settings.DEFAULT_FROM_EMAIL,
+        [email],
+        fail_silently=False,
+    )
+
+def send_password_reset_email(email, reset_link):
+    send_mail(
+        'Password Reset for LetterApp',
+        f'Hello,\n\nPlease click the link below to reset your password:\n\n{reset_link}\n\nIf you did not request this, please ignore this email.',
+        settings.DEFAULT_FROM_EMAIL,
+        [email],
+    )
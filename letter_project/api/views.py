@@ -1,72 +1,104 @@
 # api/views.py
+import hashlib
+import logging
+import re
+import secrets
+
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
-from django.conf import settings
-from django.db import transaction, models
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Exists, Max, OuterRef
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import generics, status, views
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Letter
+from .pagination import LetterCursorPagination
+from .renderers import LetterJSONRenderer
+from .tasks import run_in_background, send_signup_email, send_password_reset_email
 from .serializers import SignUpSerializer, PasswordResetSerializer, LetterSerializer
 
+logger = logging.getLogger(__name__)
+
+NUMBER_ALLOCATION_ATTEMPTS = 5
+
+# A base64-encoded user pk, as produced by urlsafe_base64_encode()
+UIDB64_RE = re.compile(r"^[A-Za-z0-9_-]{1,16}$")
+
+def next_letter_number():
+    """
+    Returns the next letter number from the `letter_number_seq` sequence.
+    nextval() is atomic, so concurrent creates never receive the same number.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT nextval('letter_number_seq')")
+        return cursor.fetchone()[0]
+
+def letter_list_etag(request, *args, **kwargs):
+    """
+    Changes whenever a letter is created, cancelled, restored or deleted, and
+    differs per page and per rendered format. No Last-Modified is sent: it has
+    one-second resolution and does not move on deletes.
+    """
+    stats = Letter.objects.aggregate(count=Count('id'), last_modified=Max('updated_at'))
+    last_modified = stats['last_modified'].isoformat() if stats['last_modified'] else ''
+    key = f"{stats['count']}|{last_modified}|{request.accepted_media_type}|{request.GET.urlencode()}"
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
 class LetterListCreateAPIView(generics.ListCreateAPIView):
     """
     API endpoint for listing all letters and creating a new one.
     """
-    queryset = Letter.objects.all()
     serializer_class = LetterSerializer
+    pagination_class = LetterCursorPagination
+    renderer_classes = [LetterJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated] # Ensures only logged-in users can access
 
+    def get_queryset(self):
+        # Only load the columns the serializer renders
+        return Letter.objects.only(
+            'id', 'number', 'subject', 'addressee',
+            'registered_by_username', 'registered_at', 'is_cancelled'
+        ).order_by('-number')
+
+    # Unchanged lists get a 304 without being serialized again
+    @method_decorator(condition(etag_func=letter_list_etag))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @transaction.atomic
     def perform_create(self, serializer):
         try:
-            # Let's debug what's in the database first
-            all_letters = Letter.objects.all().order_by('number')
-            print(f"=== DATABASE DEBUG ===")
-            for letter in all_letters:
-                print(f"Letter {letter.number}: cancelled={letter.is_cancelled}, subject='{letter.subject}'")
-            print(f"=== END DEBUG ===")
-            
-            # Get the highest number from all letters (this is the safest approach)
-            max_number = Letter.objects.aggregate(max_num=models.Max('number'))['max_num']
-            
-            if max_number is None:
-                new_number = 301  # Starting number if no letters exist
+            new_number = next_letter_number()
+            logger.debug("Allocated number %s for %s", new_number, self.request.user.username)
+
+            # The sequence never hands out the same number twice, but a letter
+            # numbered by hand (e.g. from the shell) can still collide with it.
+            for _ in range(NUMBER_ALLOCATION_ATTEMPTS):
+                try:
+                    with transaction.atomic():
+                        letter = serializer.save(
+                            number=new_number,
+                            registered_by_username=self.request.user.username
+                        )
+                    break
+                except IntegrityError:
+                    logger.warning("Letter number %s is already taken, retrying", new_number)
+                    new_number = next_letter_number()
             else:
-                new_number = max_number + 1  # Always use next sequential number
-            
-            print(f"Using next sequential number: {new_number}")
-            print(f"User: {self.request.user.username}")
-            print(f"Serializer data: {serializer.validated_data}")
-
-            # Double-check: ensure this number doesn't exist at all
-            existing_letter = Letter.objects.filter(number=new_number).exists()
-            if existing_letter:
-                print(f"ERROR: Number {new_number} already exists!")
-                # If it somehow exists, keep incrementing until we find a free number
-                while Letter.objects.filter(number=new_number).exists():
-                    new_number += 1
-                print(f"Found free number: {new_number}")
-
-            # Save with the computed number and authenticated user's username
-            letter = serializer.save(
-                number=new_number,
-                registered_by_username=self.request.user.username
-            )
-            
-            print(f"Successfully created letter: {letter}")
+                raise IntegrityError("Could not allocate a unique letter number.")
+
+            logger.debug("Created letter %s", letter)
             return letter
             
-        except Exception as e:
-            # Log the actual error for debugging
-            print(f"Error in perform_create: {str(e)}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
-            raise e
+        except Exception:
+            logger.exception("Error in perform_create")
+            raise
 
 class LetterCancelAPIView(views.APIView):
     """
@@ -74,13 +106,10 @@ class LetterCancelAPIView(views.APIView):
     """
     permission_classes = [IsAuthenticated] # Ensures only logged-in users can access
     def post(self, request, pk):
-        try:
-            letter = Letter.objects.get(pk=pk)
-            letter.is_cancelled = True
-            letter.save()
-            return Response(status=status.HTTP_200_OK)
-        except Letter.DoesNotExist:
+        updated = Letter.objects.filter(pk=pk).update(is_cancelled=True, updated_at=timezone.now())
+        if not updated:
             return Response({"error": "Letter not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_200_OK)
 
 class LetterRestoreAPIView(views.APIView):
     """
@@ -88,19 +117,21 @@ class LetterRestoreAPIView(views.APIView):
     """
     permission_classes = [IsAuthenticated] # Ensures only logged-in users can access
     def post(self, request, pk):
-        try:
-            letter_to_restore = Letter.objects.get(pk=pk, is_cancelled=True)
-            
-            is_reused = Letter.objects.filter(number=letter_to_restore.number, is_cancelled=False).exists()
-            if is_reused:
-                return Response({"error": "This number has already been reassigned."}, status=status.HTTP_409_CONFLICT)
-            
-            letter_to_restore.is_cancelled = False
-            letter_to_restore.save()
+        # Restore only if no active letter holds the same number, in one UPDATE.
+        # The correlated NOT EXISTS is a single probe into the partial
+        # letter_active_number_idx rather than a scan of every active number.
+        number_in_use = Letter.objects.filter(is_cancelled=False, number=OuterRef('number')).order_by()
+        restored = (
+            Letter.objects.filter(pk=pk, is_cancelled=True)
+            .filter(~Exists(number_in_use))
+            .update(is_cancelled=False, updated_at=timezone.now())
+        )
+        if restored:
             return Response(status=status.HTTP_200_OK)
 
-        except Letter.DoesNotExist:
-            return Response({"error": "Cancelled letter not found."}, status=status.HTTP_404_NOT_FOUND)
+        if Letter.objects.filter(pk=pk, is_cancelled=True).exists():
+            return Response({"error": "This number has already been reassigned."}, status=status.HTTP_409_CONFLICT)
+        return Response({"error": "Cancelled letter not found."}, status=status.HTTP_404_NOT_FOUND)
 
 
 # --- Authentication Views ---
@@ -112,52 +143,50 @@ class SignUpAPIView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data['email']
         username = email.split('@')[0]
-        password = User.objects.make_random_password()
+        password = secrets.token_urlsafe(12)
         user = User.objects.create_user(username=username, email=email, password=password)
-        send_mail(
-            'Your Login Credentials for LetterApp',
-            f'Hello,\n\nYour account has been created.\n\nUsername: {username}\nPassword: {password}\n\nPlease change your password after your first login.\n\nThank you!',
-            settings.DEFAULT_FROM_EMAIL,
-            [email],
-            fail_silently=False,
-        )
+        run_in_background(send_signup_email, email, username, password)
         return Response({"message": f"Credentials sent to email {email}"}, status=status.HTTP_201_CREATED)
 
 class PasswordResetRequestAPIView(views.APIView):
     def post(self, request, *args, **kwargs):
         email = request.data.get('email')
-        try:
-            user = User.objects.get(email=email)
+        user = None
+        if email:
+            # Only load the fields the token generator hashes
+            user = User.objects.filter(email__iexact=email).only('pk', 'password', 'last_login', 'email').first()
+
+        if user is not None:
             token = default_token_generator.make_token(user)
             uid = urlsafe_base64_encode(force_bytes(user.pk))
             
             # IMPORTANT: Update with your frontend URL
             reset_link = f"https://letter-frontend-gzp7.onrender.com/reset-password/{uid}/{token}/" 
             
-            send_mail(
-                'Password Reset for LetterApp',
-                f'Hello,\n\nPlease click the link below to reset your password:\n\n{reset_link}\n\nIf you did not request this, please ignore this email.',
-                settings.DEFAULT_FROM_EMAIL,
-                [email],
-            )
-            return Response({"message": "Password reset link sent."}, status=status.HTTP_200_OK)
-        except User.DoesNotExist:
-            return Response({"error": "User with this email does not exist."}, status=status.HTTP_404_NOT_FOUND)
+            run_in_background(send_password_reset_email, user.email, reset_link)
+
+        # Same response either way so the endpoint does not reveal which emails have accounts
+        return Response({"message": "If the email exists, a reset link has been sent."}, status=status.HTTP_200_OK)
 
 class PasswordResetConfirmAPIView(views.APIView):
     def post(self, request, uidb64, token, *args, **kwargs):
         serializer = PasswordResetSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
+        # Reject malformed links before they reach the database
+        if not UIDB64_RE.match(uidb64):
+            return Response({"error": "Invalid token or user."}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             uid = force_str(urlsafe_base64_decode(uidb64))
-            user = User.objects.get(pk=uid)
+            # Only the fields check_token() hashes and set_password() writes
+            user = User.objects.only('pk', 'password', 'last_login', 'email').get(pk=uid)
         except (TypeError, ValueError, OverflowError, User.DoesNotExist):
             user = None
 
         if user is not None and default_token_generator.check_token(user, token):
             user.set_password(serializer.validated_data['password'])
-            user.save()
+            user.save(update_fields=['password'])
             return Response({"message": "Password has been reset successfully."}, status=status.HTTP_200_OK)
         else:
             return Response({"error": "Invalid token or user."}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file